@@ -4,70 +4,325 @@ Database utilities for GigQ.
 This module provides thread-local SQLite connection management.
 """
 
+import logging
+import os
+import queue
 import sqlite3
+import sys
 import threading
-from typing import Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qs
+
+logger = logging.getLogger("gigq.db_utils")
+
+
+class _ConnCache(dict):
+    """
+    Per-thread mapping of database path to connection.
+
+    The cache lives in thread-local storage, so it is released when its
+    thread exits. Closing the connections at that point means threads that
+    never call :func:`close_connections` do not leak database handles.
+    """
+
+    def __del__(self):
+        for conn in self.values():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
 
 # Thread-local storage for SQLite connections
 _thread_local = threading.local()
 
+# Size of each connection's prepared-statement LRU cache (sqlite3 default: 128)
+_CACHED_STATEMENTS = 256
+
+# Process-wide pools of read-only connections, keyed by database path
+_READER_POOL_SIZE = min(8, os.cpu_count() or 1)
+_reader_pools: Dict[str, queue.SimpleQueue] = {}
+_reader_pools_lock = threading.Lock()
+
+# Per-connection settings applied to every new connection. Under WAL,
+# synchronous=NORMAL is still crash-safe (only the last commits may roll back
+# on power loss) and avoids an fsync on every commit.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA busy_timeout = 30000",
+)
+
+# Memory-map up to 256 MiB of the database so hot pages (notably the jobs
+# primary key index read by every status lookup) are served from the OS page
+# cache without a read() syscall per page, and are shared by all connections.
+# Skipped on 32-bit platforms, where that much address space is not available.
+_MMAP_SIZE = 268435456
+if sys.maxsize > 2**32:
+    _CONNECTION_PRAGMAS += (f"PRAGMA mmap_size = {_MMAP_SIZE}",)
+
+
+def _is_uri(db_path: str) -> bool:
+    """True if ``db_path`` is a SQLite ``file:`` URI."""
+    return db_path.startswith("file:")
+
+
+def _is_memory_database(db_path: str) -> bool:
+    """True if ``db_path`` names an in-memory database."""
+    if db_path in ("", ":memory:"):
+        return True
+    if not _is_uri(db_path):
+        return False
+    location, _, query = db_path[len("file:") :].partition("?")
+    return location == ":memory:" or "memory" in parse_qs(query).get("mode", [])
+
+
+def _is_shared_database(db_path: str) -> bool:
+    """True if every connection opened with ``db_path`` sees the same data."""
+    if not _is_memory_database(db_path):
+        return True
+    _, _, query = db_path.partition("?")
+    return "shared" in parse_qs(query).get("cache", [])
+
+
+def _enable_wal(conn: sqlite3.Connection, db_path: str) -> None:
+    """
+    Switch the database to WAL mode unless it already uses it.
+
+    journal_mode=WAL is persistent in the database file, so reading the
+    current mode is usually enough. It is checked on every new connection
+    rather than remembered per path, because the file may have been deleted
+    and recreated since the last connection.
+    """
+    if _is_memory_database(db_path):
+        # In-memory databases have no journal file; WAL does not apply
+        return
+
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+        return
+
+    result = conn.execute("PRAGMA journal_mode = WAL").fetchone()
+    if result[0] != "wal":
+        logger.warning(
+            "Failed to enable WAL mode for %s (got %s). "
+            "Concurrent performance may be degraded.",
+            db_path,
+            result[0],
+        )
+
 
 def get_connection(db_path: str) -> sqlite3.Connection:
     """
     Get a SQLite connection for the current thread.
 
     If a connection already exists for this thread, it will be reused.
-    Otherwise, a new connection will be created.
+    Otherwise, a new connection will be created, switched to WAL mode and
+    configured with the pragmas in ``_CONNECTION_PRAGMAS``. It stays open
+    until :func:`close_connection` or :func:`close_connections` is called,
+    or until the thread exits, so there is no need to close it after each
+    operation.
+
+    Connections are opened in autocommit mode (``isolation_level=None``):
+    each statement commits on its own unless it runs inside
+    :func:`transaction`.
+
+    ``db_path`` may also be a SQLite ``file:`` URI, for example
+    ``"file:jobs.db?cache=shared"`` to share one page cache between all of
+    the process's connections, or ``"file:jobs?mode=memory&cache=shared"``
+    for an in-memory database visible to every thread.
 
     Args:
-        db_path: Path to the SQLite database file.
+        db_path: Path to the SQLite database file, or a ``file:`` URI.
 
     Returns:
         A SQLite connection with row_factory set to sqlite3.Row.
     """
-    # Initialize a connections dict for this thread if it doesn't exist
-    if not hasattr(_thread_local, "connections"):
-        _thread_local.connections = {}
+    connections = getattr(_thread_local, "connections", None)
+    if connections is None:
+        connections = _thread_local.connections = _ConnCache()
+    else:
+        conn = connections.get(db_path)
+        if conn is not None:
+            return conn
+
+    conn = sqlite3.connect(
+        db_path,
+        timeout=30.0,
+        isolation_level=None,
+        uri=_is_uri(db_path),
+        cached_statements=_CACHED_STATEMENTS,
+    )
+    conn.row_factory = sqlite3.Row
+    _enable_wal(conn, db_path)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    connections[db_path] = conn
+    return conn
+
+
+@contextmanager
+def transaction(
+    conn: sqlite3.Connection, mode: str = "IMMEDIATE"
+) -> Iterator[sqlite3.Connection]:
+    """
+    Run a block of statements in an explicit transaction.
+
+    ``BEGIN IMMEDIATE`` takes the write lock up front, so concurrent writers
+    wait (up to ``busy_timeout``) before doing any work instead of failing
+    with ``SQLITE_BUSY`` when a deferred transaction tries to upgrade its
+    read lock. The transaction is committed when the block exits normally
+    and rolled back if it raises or the commit fails.
+
+    Args:
+        conn: A connection from :func:`get_connection`.
+        mode: Transaction mode: ``"DEFERRED"``, ``"IMMEDIATE"`` or
+            ``"EXCLUSIVE"``.
+    """
+    conn.execute(f"BEGIN {mode}")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        # Also covers a failed COMMIT, which leaves the transaction open
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def _reader_pool(db_path: str) -> queue.SimpleQueue:
+    pool = _reader_pools.get(db_path)
+    if pool is None:
+        with _reader_pools_lock:
+            pool = _reader_pools.setdefault(db_path, queue.SimpleQueue())
+    return pool
+
+
+def acquire_reader(db_path: str) -> sqlite3.Connection:
+    """
+    Borrow a read-only SQLite connection from the process-wide pool.
+
+    Pooled readers are shared between threads, so they are opened with
+    ``check_same_thread=False``. Under WAL mode they never block, and are
+    never blocked by, the thread-local read-write connections. Every
+    connection acquired here must be handed back with :func:`release_reader`.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        A read-only SQLite connection with row_factory set to sqlite3.Row.
+    """
+    try:
+        return _reader_pool(db_path).get_nowait()
+    except queue.Empty:
+        pass
+
+    uri = f"{Path(db_path).absolute().as_uri()}?mode=ro"
+    conn = sqlite3.connect(
+        uri,
+        uri=True,
+        timeout=30.0,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=_CACHED_STATEMENTS,
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def release_reader(db_path: str, conn: sqlite3.Connection) -> None:
+    """
+    Return a connection obtained from :func:`acquire_reader` to the pool.
 
-    # Get or create a connection for this database
-    if db_path not in _thread_local.connections:
-        conn = sqlite3.connect(db_path, timeout=30.0)
-        conn.row_factory = sqlite3.Row
-        result = conn.execute("PRAGMA journal_mode = WAL").fetchone()
-        if result[0] != "wal":
-            import logging
+    The connection is closed instead if the pool is already full.
 
-            logging.getLogger("gigq.db_utils").warning(
-                "Failed to enable WAL mode for %s (got %s). "
-                "Concurrent performance may be degraded.",
-                db_path,
-                result[0],
-            )
-        _thread_local.connections[db_path] = conn
+    Args:
+        db_path: Path to the SQLite database file.
+        conn: The connection to return.
+    """
+    pool = _reader_pool(db_path)
+    if pool.qsize() < _READER_POOL_SIZE:
+        pool.put(conn)
+    else:
+        conn.close()
 
-    return _thread_local.connections[db_path]
+
+@contextmanager
+def reader(db_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Context manager yielding a connection for read-only queries.
+
+    On-disk databases use a pooled read-only connection. In-memory
+    databases and ``file:`` URIs (whose options a read-only URI would not
+    preserve) use the thread-local connection.
+
+    Args:
+        db_path: Path to the SQLite database file, or a ``file:`` URI.
+    """
+    if _is_uri(db_path) or _is_memory_database(db_path):
+        yield get_connection(db_path)
+        return
+
+    conn = acquire_reader(db_path)
+    try:
+        yield conn
+    finally:
+        release_reader(db_path, conn)
 
 
 def close_connections() -> None:
     """
     Close all SQLite connections for the current thread.
 
-    This should be called when a thread is finishing its work
+    Pooled read-only connections (see :func:`acquire_reader`) are closed as
+    well. This should be called when a thread is finishing its work
     to clean up resources.
     """
-    if hasattr(_thread_local, "connections"):
-        for conn in _thread_local.connections.values():
+    connections = getattr(_thread_local, "connections", None)
+    if connections:
+        for conn in connections.values():
             conn.close()
-        _thread_local.connections.clear()
+        connections.clear()
+
+    with _reader_pools_lock:
+        pools = list(_reader_pools.values())
+        _reader_pools.clear()
+    for pool in pools:
+        _close_pool(pool)
 
 
 def close_connection(db_path: str) -> None:
     """
     Close the SQLite connection for the specified database path.
 
+    Idle pooled read-only connections to the database are closed as well.
+    Only needed to release the database early (for example before deleting
+    the file); connections are closed automatically when their thread exits.
+
     Args:
         db_path: Path to the SQLite database file.
     """
-    if hasattr(_thread_local, "connections") and db_path in _thread_local.connections:
-        _thread_local.connections[db_path].close()
-        del _thread_local.connections[db_path]
+    connections = getattr(_thread_local, "connections", None)
+    if connections:
+        conn = connections.pop(db_path, None)
+        if conn is not None:
+            conn.close()
+
+    with _reader_pools_lock:
+        pool = _reader_pools.pop(db_path, None)
+    if pool is not None:
+        _close_pool(pool)
+
+
+def _close_pool(pool: queue.SimpleQueue) -> None:
+    """Close the idle connections in a reader pool."""
+    while True:
+        try:
+            pool.get_nowait().close()
+        except queue.Empty:
+            break
@@ -4,10 +4,39 @@ Job class for GigQ.
 This module contains the Job class which represents a unit of work to be executed.
 """
 
-import uuid
+import itertools
+import os
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
+# Job IDs are UUID4-formatted strings made of a 48-bit counter followed by a
+# random per-process suffix, so creating a job does not need an os.urandom()
+# call each time. The counter's low 32 bits come first so consecutive IDs are
+# easy to tell apart by eye.
+_id_suffix = ""
+_id_counter = itertools.count()
+
+
+def _reset_job_id_generator() -> None:
+    """Draw a new random ID suffix and restart the counter."""
+    global _id_suffix, _id_counter
+    h = os.urandom(10).hex()
+    variant = "89ab"[int(h[3], 16) & 0x3]
+    _id_suffix = f"4{h[0:3]}-{variant}{h[4:7]}-{h[7:19]}"
+    _id_counter = itertools.count(int.from_bytes(os.urandom(4), "big"))
+
+
+_reset_job_id_generator()
+# A forked child must not reuse its parent's suffix and counter
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_job_id_generator)
+
+
+def _new_job_id() -> str:
+    """Return a new job ID, unique across threads and processes."""
+    n = f"{next(_id_counter) & 0xFFFFFFFFFFFF:012x}"
+    return f"{n[4:]}-{n[:4]}-{_id_suffix}"
+
 
 class Job:
     """
@@ -48,7 +77,7 @@ class Job:
             retry_delay: Seconds to wait before a failed job becomes eligible for
                 retry. Defaults to 0 (immediate retry, preserving existing behavior).
         """
-        self.id = str(uuid.uuid4())
+        self.id = _new_job_id()
         self.name = name
         self.function = function
         self.params = params or {}
@@ -5,7 +5,7 @@ This module contains the JobQueue class which manages the storage and retrieval
 using SQLite as a backend.
 """
 
-import json
+import functools
 import logging
 import sqlite3
 from datetime import datetime
@@ -13,7 +13,9 @@ from typing import Any, Dict, List, Optional, Union
 
 from .job import Job
 from .job_status import JobStatus
-from .db_utils import get_connection, close_connection
+from .utils import json_dumps, json_loads
+from .db_utils import get_connection, reader, transaction
+from .write_worker import get_write_worker
 
 # Configure logging
 logger = logging.getLogger("gigq.job_queue")
@@ -30,6 +32,137 @@ def _normalize_pass_parent_results_db_value(value: Any) -> Optional[bool]:
     return None
 
 
+# Stored in PRAGMA user_version once the schema is created. Bump it whenever
+# _create_schema() changes so existing databases are migrated.
+SCHEMA_VERSION = 1
+
+_INSERT_JOB_PREFIX = """
+    INSERT INTO jobs (
+        id, name, function_name, function_module, params, priority,
+        dependencies, max_attempts, timeout, description, status,
+        created_at, updated_at, attempts, pass_parent_results,
+        retry_delay
+    ) VALUES """
+_INSERT_JOB_PLACEHOLDERS = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_JOB_SQL = _INSERT_JOB_PREFIX + _INSERT_JOB_PLACEHOLDERS
+
+# submit_many() batches larger than this use multi-row INSERT statements of
+# at most _MULTI_ROW_INSERT_MAX_ROWS rows each. Much larger statements are
+# slower again because of their parse cost.
+_MULTI_ROW_INSERT_THRESHOLD = 64
+_MULTI_ROW_INSERT_MAX_ROWS = 256
+
+# Default SQLITE_MAX_VARIABLE_NUMBER for SQLite < 3.32
+_DEFAULT_MAX_VARIABLES = 999
+
+# Columns of the jobs table, in the order they are selected by _SELECT_JOB_SQL
+_JOB_COLUMNS = (
+    "id",
+    "name",
+    "function_name",
+    "function_module",
+    "params",
+    "priority",
+    "dependencies",
+    "max_attempts",
+    "timeout",
+    "description",
+    "status",
+    "created_at",
+    "updated_at",
+    "attempts",
+    "result",
+    "error",
+    "started_at",
+    "completed_at",
+    "worker_id",
+    "pass_parent_results",
+    "retry_delay",
+    "retry_after",
+)
+
+_SELECT_JOB_SQL = f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE id = ?"
+
+_LIST_JOBS_SQL = (
+    f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT ?"
+)
+
+_LIST_JOBS_BY_STATUS_SQL = (
+    f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE status = ? "
+    "ORDER BY created_at DESC LIMIT ?"
+)
+
+_SELECT_EXECUTIONS_SQL = (
+    "SELECT * FROM job_executions WHERE job_id = ? ORDER BY started_at ASC"
+)
+
+_SELECT_RESULT_SQL = "SELECT status, result FROM jobs WHERE id = ?"
+
+_CANCEL_JOB_SQL = (
+    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _multi_row_insert_sql(row_count: int) -> str:
+    """Return an INSERT statement for ``row_count`` jobs at once."""
+    return _INSERT_JOB_PREFIX + ", ".join([_INSERT_JOB_PLACEHOLDERS] * row_count)
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in the database's user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _job_row(job: Job, now: str) -> tuple:
+    """Build the ``_INSERT_JOB_SQL`` parameters for a new pending job."""
+    pass_val = None
+    if job.pass_parent_results is True:
+        pass_val = 1
+    elif job.pass_parent_results is False:
+        pass_val = 0
+
+    # Store function as module and name for later import
+    return (
+        job.id,
+        job.name,
+        job.function.__name__,
+        job.function.__module__,
+        json_dumps(job.params),
+        job.priority,
+        json_dumps(job.dependencies),
+        job.max_attempts,
+        job.timeout,
+        job.description,
+        JobStatus.PENDING.value,
+        job.created_at,
+        now,
+        0,
+        pass_val,
+        job.retry_delay,
+    )
+
+
+def _job_dict(row: tuple) -> Dict[str, Any]:
+    """
+    Build a job dictionary from a plain tuple row in ``_JOB_COLUMNS`` order.
+
+    Zipping with the fixed column tuple avoids ``sqlite3.Row`` and its
+    per-column name lookups; JSON fields are deserialized.
+    """
+    job = dict(zip(_JOB_COLUMNS, row))
+    if job["params"]:
+        job["params"] = json_loads(job["params"])
+    if job["dependencies"]:
+        job["dependencies"] = json_loads(job["dependencies"])
+    if job["result"]:
+        job["result"] = json_loads(job["result"])
+    job["pass_parent_results"] = _normalize_pass_parent_results_db_value(
+        job["pass_parent_results"]
+    )
+    return job
+
+
 class JobQueue:
     """
     Manages a queue of jobs using SQLite as a backend.
@@ -44,12 +177,28 @@ class JobQueue:
             initialize: Whether to initialize the database if it doesn't exist.
         """
         self.db_path = db_path
+        self._writer = get_write_worker(db_path)
         if initialize:
             self._initialize_db()
 
     def _initialize_db(self):
         """Create the necessary database tables if they don't exist."""
         conn = self._get_connection()
+
+        # Fast path: the schema is already current, so no DDL (and no write
+        # lock) is needed.
+        if _schema_version(conn) >= SCHEMA_VERSION:
+            return
+
+        with transaction(conn, "EXCLUSIVE"):
+            # Another connection may have initialized it while we waited
+            if _schema_version(conn) >= SCHEMA_VERSION:
+                return
+            self._create_schema(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        """Create tables and indices, and migrate older schemas (idempotent)."""
         cursor = conn.cursor()
 
         # Jobs table
@@ -107,8 +256,6 @@ class JobQueue:
         """
         )
 
-        conn.commit()
-
     def _ensure_job_columns(self, conn: sqlite3.Connection) -> None:
         """Add columns introduced after the initial schema (idempotent)."""
         cursor = conn.execute("PRAGMA table_info(jobs)")
@@ -141,53 +288,63 @@ class JobQueue:
         Returns:
             The ID of the submitted job.
         """
-        conn = self._get_connection()
+        # Insert the job into the database. Concurrent submissions from other
+        # threads are committed together in one transaction.
+        self._writer.execute(_INSERT_JOB_SQL, _job_row(job, datetime.now().isoformat()))
+
+        logger.info(f"Job submitted: {job.id} ({job.name})")
+        return job.id
+
+    def submit_many(self, jobs: List[Job]) -> List[str]:
+        """
+        Submit several jobs to the queue in a single transaction.
 
-        # Store function as module and name for later import
-        function_module = job.function.__module__
-        function_name = job.function.__name__
+        This is much faster than calling :meth:`submit` in a loop, since
+        SQLite only has to commit once. Either all jobs are submitted or,
+        if any insert fails, none are.
 
+        Args:
+            jobs: The jobs to submit.
+
+        Returns:
+            The IDs of the submitted jobs, in the same order as ``jobs``.
+        """
+        if not jobs:
+            return []
+
+        conn = self._get_connection()
         now = datetime.now().isoformat()
+        rows = [_job_row(job, now) for job in jobs]
 
-        pass_val = None
-        if job.pass_parent_results is True:
-            pass_val = 1
-        elif job.pass_parent_results is False:
-            pass_val = 0
+        with transaction(conn):
+            if len(rows) > _MULTI_ROW_INSERT_THRESHOLD:
+                self._insert_multi_row(conn, rows)
+            else:
+                conn.executemany(_INSERT_JOB_SQL, rows)
 
-        # Insert the job into the database
-        with conn:
-            conn.execute(
-                """
-                INSERT INTO jobs (
-                    id, name, function_name, function_module, params, priority,
-                    dependencies, max_attempts, timeout, description, status,
-                    created_at, updated_at, attempts, pass_parent_results,
-                    retry_delay
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    job.id,
-                    job.name,
-                    function_name,
-                    function_module,
-                    json.dumps(job.params),
-                    job.priority,
-                    json.dumps(job.dependencies),
-                    job.max_attempts,
-                    job.timeout,
-                    job.description,
-                    JobStatus.PENDING.value,
-                    job.created_at,
-                    now,
-                    0,
-                    pass_val,
-                    job.retry_delay,
-                ),
-            )
+        logger.info(f"{len(jobs)} jobs submitted")
+        return [job.id for job in jobs]
 
-        logger.info(f"Job submitted: {job.id} ({job.name})")
-        return job.id
+    def _insert_multi_row(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        """
+        Insert rows using as few multi-row INSERT statements as possible.
+
+        Each statement binds up to ``_MULTI_ROW_INSERT_MAX_ROWS`` rows (fewer
+        if SQLite's host-parameter limit is lower), so a large batch needs
+        far fewer statement executions than one per row.
+        """
+        if hasattr(conn, "getlimit"):  # Python 3.11+
+            max_variables = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        else:
+            max_variables = _DEFAULT_MAX_VARIABLES
+        chunk_size = max(
+            1, min(_MULTI_ROW_INSERT_MAX_ROWS, max_variables // len(rows[0]))
+        )
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            params = [value for row in chunk for value in row]
+            conn.execute(_multi_row_insert_sql(len(chunk)), params)
 
     def cancel(self, job_id: str) -> bool:
         """
@@ -201,9 +358,9 @@ class JobQueue:
         """
         conn = self._get_connection()
 
-        with conn:
+        with transaction(conn):
             cursor = conn.execute(
-                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                _CANCEL_JOB_SQL,
                 (
                     JobStatus.CANCELLED.value,
                     datetime.now().isoformat(),
@@ -231,39 +388,29 @@ class JobQueue:
         Returns:
             A dictionary containing the job's status and related information.
         """
-        conn = self._get_connection()
+        with reader(self.db_path) as conn:
+            return self._read_status(conn, job_id)
 
-        cursor = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-        job_data = cursor.fetchone()
+    def _read_status(self, conn: sqlite3.Connection, job_id: str) -> Dict[str, Any]:
+        """Load a job row and its execution history using ``conn``."""
+        # Plain tuples are cheaper than sqlite3.Row; the column names are
+        # known up front from _JOB_COLUMNS.
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        job_data = cursor.execute(_SELECT_JOB_SQL, (job_id,)).fetchone()
 
         if not job_data:
             return {"exists": False}
 
-        result = dict(job_data)
-
-        # Deserialize JSON fields
-        if result["params"]:
-            result["params"] = json.loads(result["params"])
-        if result["dependencies"]:
-            result["dependencies"] = json.loads(result["dependencies"])
-        if result["result"]:
-            result["result"] = json.loads(result["result"])
-        if "pass_parent_results" in result:
-            result["pass_parent_results"] = _normalize_pass_parent_results_db_value(
-                result["pass_parent_results"]
-            )
-
+        result = _job_dict(job_data)
         result["exists"] = True
 
         # Get execution history
-        cursor = conn.execute(
-            "SELECT * FROM job_executions WHERE job_id = ? ORDER BY started_at ASC",
-            (job_id,),
-        )
+        cursor = conn.execute(_SELECT_EXECUTIONS_SQL, (job_id,))
         executions = [dict(row) for row in cursor.fetchall()]
         for execution in executions:
             if execution["result"]:
-                execution["result"] = json.loads(execution["result"])
+                execution["result"] = json_loads(execution["result"])
 
         result["executions"] = executions
 
@@ -288,10 +435,9 @@ class JobQueue:
         Raises:
             KeyError: If the job with the given ID does not exist.
         """
-        conn = self._get_connection()
-
-        cursor = conn.execute("SELECT status, result FROM jobs WHERE id = ?", (job_id,))
-        row = cursor.fetchone()
+        with reader(self.db_path) as conn:
+            cursor = conn.execute(_SELECT_RESULT_SQL, (job_id,))
+            row = cursor.fetchone()
 
         if not row:
             raise KeyError(f"Job with id {job_id!r} not found")
@@ -303,7 +449,7 @@ class JobQueue:
         if not raw_result:
             return None
 
-        return json.loads(raw_result)
+        return json_loads(raw_result)
 
     def list_jobs(
         self, status: Optional[Union[JobStatus, str]] = None, limit: int = 100
@@ -318,41 +464,17 @@ class JobQueue:
         Returns:
             A list of job dictionaries.
         """
-        conn = self._get_connection()
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None
 
         if status:
             if isinstance(status, JobStatus):
                 status = status.value
-            cursor = conn.execute(
-                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
-                (status, limit),
-            )
+            cursor.execute(_LIST_JOBS_BY_STATUS_SQL, (status, limit))
         else:
-            cursor = conn.execute(
-                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
-            )
-
-        results = []
-        for row in cursor.fetchall():
-            job_dict = dict(row)
-
-            # Deserialize JSON fields
-            if job_dict["params"]:
-                job_dict["params"] = json.loads(job_dict["params"])
-            if job_dict["dependencies"]:
-                job_dict["dependencies"] = json.loads(job_dict["dependencies"])
-            if job_dict["result"]:
-                job_dict["result"] = json.loads(job_dict["result"])
-            if "pass_parent_results" in job_dict:
-                job_dict["pass_parent_results"] = (
-                    _normalize_pass_parent_results_db_value(
-                        job_dict["pass_parent_results"]
-                    )
-                )
+            cursor.execute(_LIST_JOBS_SQL, (limit,))
 
-            results.append(job_dict)
-
-        return results
+        return [_job_dict(row) for row in cursor.fetchall()]
 
     def stats(self) -> Dict[str, int]:
         """
@@ -403,7 +525,7 @@ class JobQueue:
         """
         conn = self._get_connection()
 
-        with conn:
+        with transaction(conn):
             if before_timestamp:
                 cursor = conn.execute(
                     "DELETE FROM jobs WHERE status IN (?, ?) AND completed_at < ?",
@@ -433,7 +555,7 @@ class JobQueue:
         """
         conn = self._get_connection()
 
-        with conn:
+        with transaction(conn):
             cursor = conn.execute(
                 """
                 UPDATE jobs
@@ -453,5 +575,19 @@ class JobQueue:
             return cursor.rowcount > 0
 
     def close(self) -> None:
-        """Close the database connection for this thread."""
-        close_connection(self.db_path)
+        """
+        Release this queue.
+
+        This is cheap and safe to call after every use. Read-only connections
+        are already back in the shared pool after each call, and the thread's
+        read-write connection is kept open so the next ``JobQueue`` or
+        ``Worker`` on this thread can reuse it without reconnecting. That
+        connection is closed when the thread exits, or explicitly by
+        :func:`gigq.close_connections`, so there is nothing to release here.
+        """
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
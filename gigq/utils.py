@@ -4,14 +4,73 @@ Utility functions for GigQ.
 This module contains utility functions used across the GigQ package.
 """
 
+import json
 import logging
+import re
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional (pip install gigq[fast])
+    orjson = None
+
+# Separators without the whitespace json.dumps adds by default
+_COMPACT_SEPARATORS = (",", ":")
+
+# Runs of this many digits may be an integer wider than 64 bits, which
+# orjson.loads would silently turn into a float.
+_LONG_DIGITS = re.compile(r"\d{19}")
 
 # Configure root logger
 logger = logging.getLogger("gigq")
 
 
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize ``obj`` to a JSON string for storage in the database.
+
+    Always uses the standard library, so the values accepted and the text
+    stored do not depend on whether ``orjson`` is installed (orjson would
+    accept types such as ``datetime`` and ``UUID`` that ``json`` rejects,
+    and store ``NaN`` as ``null``).
+
+    Args:
+        obj: The value to serialize.
+
+    Returns:
+        The JSON text.
+
+    Raises:
+        TypeError: If ``obj`` contains a value ``json`` cannot serialize.
+    """
+    return json.dumps(obj, separators=_COMPACT_SEPARATORS)
+
+
+def json_loads(data: str) -> Any:
+    """
+    Deserialize a JSON string read from the database.
+
+    Uses ``orjson`` when it is installed, which is several times faster than
+    the standard library. Text orjson would read differently from ``json``
+    falls back to ``json``: text orjson rejects (such as ``NaN``), and text
+    containing long digit runs, since orjson reads integers wider than 64
+    bits as floats.
+
+    Args:
+        data: The JSON text.
+
+    Returns:
+        The deserialized value.
+    """
+    if orjson is not None and not _LONG_DIGITS.search(data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
 def setup_logging(level: int = logging.INFO) -> None:
     """
     Opt-in logging configuration for GigQ (stderr, standard format).
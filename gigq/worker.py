@@ -5,7 +5,6 @@ This module contains the Worker class which processes jobs from the queue.
 """
 
 import inspect
-import json
 import logging
 import signal
 import sqlite3
@@ -17,7 +16,8 @@ from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, List, Optional
 
 from .job_status import JobStatus
-from .db_utils import get_connection, close_connection
+from .utils import json_dumps, json_loads
+from .db_utils import close_connection, get_connection, transaction
 from .job_queue import _normalize_pass_parent_results_db_value
 
 # Configure logging
@@ -154,7 +154,7 @@ class Worker:
             if raw is None:
                 out[pid] = None
             else:
-                out[pid] = json.loads(raw)
+                out[pid] = json_loads(raw)
         return out
 
     def _import_function(self, module_name: str, function_name: str) -> Callable:
@@ -213,7 +213,7 @@ class Worker:
 
                 potential_jobs = cursor.fetchall()
                 for potential_job in potential_jobs:
-                    dependencies = json.loads(potential_job["dependencies"])
+                    dependencies = json_loads(potential_job["dependencies"])
                     if not dependencies:
                         continue
 
@@ -271,9 +271,9 @@ class Worker:
 
             # Deserialize JSON fields
             if result["params"]:
-                result["params"] = json.loads(result["params"])
+                result["params"] = json_loads(result["params"])
             if result["dependencies"]:
-                result["dependencies"] = json.loads(result["dependencies"])
+                result["dependencies"] = json_loads(result["dependencies"])
 
             if "pass_parent_results" in result:
                 result["pass_parent_results"] = _normalize_pass_parent_results_db_value(
@@ -310,9 +310,9 @@ class Worker:
         """
         conn = self._get_connection()
         now = datetime.now().isoformat()
-        result_json = json.dumps(result) if result is not None else None
+        result_json = json_dumps(result) if result is not None else None
 
-        with conn:
+        with transaction(conn):
             # Update the job
             conn.execute(
                 """
@@ -338,74 +338,87 @@ class Worker:
         """Check for jobs that have timed out and mark them accordingly."""
         conn = self._get_connection()
 
-        with conn:
-            cursor = conn.execute(
-                """
-                SELECT j.id, j.timeout, j.started_at, j.worker_id, j.attempts, j.max_attempts, j.retry_delay
-                FROM jobs j
-                WHERE j.status = ?
-                """,
-                (JobStatus.RUNNING.value,),
-            )
+        # Scan without a transaction so the common case (nothing has timed
+        # out) never takes the write lock.
+        cursor = conn.execute(
+            """
+            SELECT j.id, j.timeout, j.started_at, j.worker_id, j.attempts, j.max_attempts, j.retry_delay
+            FROM jobs j
+            WHERE j.status = ?
+            """,
+            (JobStatus.RUNNING.value,),
+        )
 
-            running_jobs = cursor.fetchall()
-            now = datetime.now()
+        running_jobs = cursor.fetchall()
+        now = datetime.now()
 
-            for job in running_jobs:
-                if not job["started_at"]:
-                    continue
+        timed_out_jobs = []
+        for job in running_jobs:
+            if not job["started_at"]:
+                continue
 
-                started_at = datetime.fromisoformat(job["started_at"])
-                timeout_seconds = job["timeout"] or 300  # Default 5 minutes
+            started_at = datetime.fromisoformat(job["started_at"])
+            timeout_seconds = job["timeout"] or 300  # Default 5 minutes
 
-                if now - started_at > timedelta(seconds=timeout_seconds):
-                    # Job has timed out
-                    will_retry = job["attempts"] < job["max_attempts"]
-                    status = JobStatus.PENDING if will_retry else JobStatus.TIMEOUT
+            if now - started_at > timedelta(seconds=timeout_seconds):
+                timed_out_jobs.append((job, timeout_seconds))
 
-                    retry_after = None
-                    if will_retry:
-                        retry_delay = job["retry_delay"] or 0
-                        if retry_delay > 0:
-                            retry_after = (
-                                now + timedelta(seconds=retry_delay)
-                            ).isoformat()
-
-                    self._log.warning(
-                        f"Job {job['id']} timed out after {timeout_seconds} seconds"
-                    )
+        if not timed_out_jobs:
+            return
 
-                    conn.execute(
-                        """
-                        UPDATE jobs
-                        SET status = ?, updated_at = ?, worker_id = NULL,
-                            error = ?, retry_after = ?
-                        WHERE id = ?
-                        """,
-                        (
-                            status.value,
-                            now.isoformat(),
-                            f"Job timed out after {timeout_seconds} seconds",
-                            retry_after,
-                            job["id"],
-                        ),
-                    )
+        with transaction(conn):
+            for job, timeout_seconds in timed_out_jobs:
+                # Job has timed out
+                will_retry = job["attempts"] < job["max_attempts"]
+                status = JobStatus.PENDING if will_retry else JobStatus.TIMEOUT
 
-                    # Also update any execution records
-                    conn.execute(
-                        """
-                        UPDATE job_executions
-                        SET status = ?, completed_at = ?, error = ?
-                        WHERE job_id = ? AND status = ?
-                        """,
-                        (
-                            JobStatus.TIMEOUT.value,
-                            now.isoformat(),
-                            f"Job timed out after {timeout_seconds} seconds",
-                            job["id"],
-                            JobStatus.RUNNING.value,
-                        ),
-                    )
+                retry_after = None
+                if will_retry:
+                    retry_delay = job["retry_delay"] or 0
+                    if retry_delay > 0:
+                        retry_after = (now + timedelta(seconds=retry_delay)).isoformat()
+
+                # Only touch the job if it is still the same running attempt;
+                # it may have completed since the scan above.
+                cursor = conn.execute(
+                    """
+                    UPDATE jobs
+                    SET status = ?, updated_at = ?, worker_id = NULL,
+                        error = ?, retry_after = ?
+                    WHERE id = ? AND status = ? AND started_at = ?
+                    """,
+                    (
+                        status.value,
+                        now.isoformat(),
+                        f"Job timed out after {timeout_seconds} seconds",
+                        retry_after,
+                        job["id"],
+                        JobStatus.RUNNING.value,
+                        job["started_at"],
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    continue
+
+                self._log.warning(
+                    f"Job {job['id']} timed out after {timeout_seconds} seconds"
+                )
+
+                # Also update any execution records
+                conn.execute(
+                    """
+                    UPDATE job_executions
+                    SET status = ?, completed_at = ?, error = ?
+                    WHERE job_id = ? AND status = ?
+                    """,
+                    (
+                        JobStatus.TIMEOUT.value,
+                        now.isoformat(),
+                        f"Job timed out after {timeout_seconds} seconds",
+                        job["id"],
+                        JobStatus.RUNNING.value,
+                    ),
+                )
 
     def process_one(self) -> bool:
         """
@@ -458,7 +471,7 @@ class Worker:
             if job["attempts"] < job["max_attempts"]:
                 # We'll retry
                 conn = self._get_connection()
-                with conn:
+                with transaction(conn):
                     now_dt = datetime.now()
                     now = now_dt.isoformat()
                     retry_delay = job.get("retry_delay") or 0
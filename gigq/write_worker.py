@@ -0,0 +1,153 @@
+"""
+Write coalescing for GigQ.
+
+This module contains the WriteWorker class which groups concurrent writes to
+the same database into shared transactions.
+"""
+
+import queue
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, List, Sequence, Tuple
+
+from .db_utils import _is_shared_database, get_connection, transaction
+
+# Maximum number of pending writes committed in one transaction
+MAX_BATCH_SIZE = 32
+
+# One WriteWorker per database path, shared by all JobQueue instances. The
+# queues hold the strong references, so a path's worker is dropped once no
+# queue uses it.
+_write_workers: "weakref.WeakValueDictionary[str, WriteWorker]" = (
+    weakref.WeakValueDictionary()
+)
+_write_workers_lock = threading.Lock()
+
+
+def get_write_worker(db_path: str) -> "WriteWorker":
+    """
+    Get the process-wide WriteWorker for a database, creating it if needed.
+
+    Only a weak reference is kept here; callers must hold on to the returned
+    worker for as long as they use it.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        The WriteWorker for ``db_path``.
+    """
+    worker = _write_workers.get(db_path)
+    if worker is None:
+        with _write_workers_lock:
+            worker = _write_workers.get(db_path)
+            if worker is None:
+                worker = _write_workers[db_path] = WriteWorker(db_path)
+    return worker
+
+
+class WriteWorker:
+    """
+    Coalesces concurrent writes to one database into shared transactions.
+
+    Every call to :meth:`execute` queues its statement and then waits for the
+    leader lock. The thread holding the lock drains up to ``max_batch_size``
+    pending writes and runs them in one ``BEGIN IMMEDIATE ... COMMIT`` on
+    its own thread-local connection. Threads whose writes were committed
+    by another leader return as soon as they get the lock. Without
+    contention only the caller's own write is pending, so it runs right away
+    on the caller's thread, just like an unbatched write.
+
+    Private in-memory databases (``":memory:"`` without ``cache=shared``)
+    are separate for each connection, so their writes are never batched
+    across threads.
+    """
+
+    def __init__(self, db_path: str, max_batch_size: int = MAX_BATCH_SIZE):
+        """
+        Initialize the write worker.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            max_batch_size: Maximum number of writes per transaction.
+        """
+        self.db_path = db_path
+        self.max_batch_size = max_batch_size
+        self._coalesce = _is_shared_database(db_path)
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._leader = threading.Lock()
+
+    def execute(self, sql: str, params: Sequence[Any]) -> None:
+        """
+        Execute a write statement, possibly batched with other threads' writes.
+
+        Returns once the statement has been committed.
+
+        Args:
+            sql: The SQL statement to execute.
+            params: Parameters for the statement.
+
+        Raises:
+            sqlite3.Error: If the statement itself fails. Other writes in the
+                same batch are unaffected.
+        """
+        if not self._coalesce:
+            conn = get_connection(self.db_path)
+            with transaction(conn):
+                conn.execute(sql, params)
+            return
+
+        future: Future = Future()
+        self._pending.put((sql, params, future))
+        with self._leader:
+            while not future.done():
+                self._commit_batch()
+        future.result()
+
+    def _commit_batch(self) -> None:
+        """Commit up to ``max_batch_size`` pending writes in one transaction."""
+        batch: List[Tuple[str, Sequence[Any], Future]] = []
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+
+        conn = get_connection(self.db_path)
+        try:
+            try:
+                with transaction(conn):
+                    for sql, rows in _group_by_statement(batch):
+                        conn.executemany(sql, rows)
+            except Exception:
+                # Retry one by one so only the offending write fails
+                for sql, params, future in batch:
+                    try:
+                        with transaction(conn):
+                            conn.execute(sql, params)
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(None)
+            else:
+                for _, _, future in batch:
+                    future.set_result(None)
+        finally:
+            # Never leave a waiting thread without an outcome
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Write was not committed"))
+
+
+def _group_by_statement(
+    batch: List[Tuple[str, Sequence[Any], Future]],
+) -> List[Tuple[str, List[Sequence[Any]]]]:
+    """Group consecutive writes that use the same SQL for ``executemany``."""
+    groups: List[Tuple[str, List[Sequence[Any]]]] = []
+    for sql, params, _ in batch:
+        if groups and groups[-1][0] == sql:
+            groups[-1][1].append(params)
+        else:
+            groups.append((sql, [params]))
+    return groups
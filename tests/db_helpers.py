@@ -0,0 +1,23 @@
+"""Database fixtures and thread pool shared by GigQ tests."""
+
+import os
+import tempfile
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads shared by the threaded tests, reused across the test run
+THREAD_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def memory_database() -> str:
+    """Return a URI for a new in-memory database shared by all threads."""
+    return f"file:memdb_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+
+def file_database(test_case: unittest.TestCase) -> str:
+    """Create a temporary database file, removed after ``test_case``."""
+    fd, db_path = tempfile.mkstemp()
+    os.close(fd)
+    test_case.addCleanup(os.unlink, db_path)
+    return db_path
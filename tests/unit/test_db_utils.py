@@ -3,26 +3,34 @@ Unit tests for the db_utils module in GigQ.
 """
 
 import os
-import tempfile
 import threading
 import unittest
 import sqlite3
-from gigq.db_utils import get_connection, close_connection, close_connections
+import sys
+from unittest import mock
+from gigq.db_utils import (
+    acquire_reader,
+    close_connection,
+    close_connections,
+    get_connection,
+    reader,
+    release_reader,
+    transaction,
+)
+from tests.db_helpers import THREAD_POOL, file_database, memory_database
 
 
 class TestDBUtils(unittest.TestCase):
     """Tests for the db_utils module."""
 
     def setUp(self):
-        """Set up a temporary database for testing."""
-        self.db_fd, self.db_path = tempfile.mkstemp()
+        """Set up a shared in-memory database for testing."""
+        self.db_path = memory_database()
 
     def tearDown(self):
-        """Clean up the temporary database."""
-        # Close any open connections
+        """Clean up the in-memory database."""
+        # Close any open connections; closing the last one frees the database
         close_connections()
-        os.close(self.db_fd)
-        os.unlink(self.db_path)
 
     def test_get_connection(self):
         """Test getting a connection from thread-local storage."""
@@ -44,12 +52,142 @@ class TestDBUtils(unittest.TestCase):
         # Close the connection
         close_connection(self.db_path)
 
+    def test_connection_pragmas(self):
+        """Test that new connections use WAL mode and the tuned pragmas."""
+        db_path = file_database(self)
+        conn = get_connection(db_path)
+
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        # synchronous=NORMAL is reported as 1, temp_store=MEMORY as 2
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+        self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -65536)
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 30000)
+        if sys.maxsize > 2**32:
+            self.assertEqual(conn.execute("PRAGMA mmap_size").fetchone()[0], 268435456)
+
+        close_connection(db_path)
+
+    def test_wal_after_database_recreated(self):
+        """Test that a database recreated at the same path is switched to WAL."""
+        db_path = file_database(self)
+        get_connection(db_path)
+        close_connections()
+
+        os.unlink(db_path)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+
+        conn = get_connection(db_path)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        close_connection(db_path)
+
+    def test_readers_after_database_recreated(self):
+        """Test that close_connection() releases pooled readers for the path."""
+        db_path = file_database(self)
+        writer = get_connection(db_path)
+        writer.execute("CREATE TABLE items (id INTEGER)")
+        writer.execute("INSERT INTO items VALUES (1)")
+        with reader(db_path) as conn:
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 1
+            )
+
+        close_connection(db_path)
+        os.unlink(db_path)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+        writer = get_connection(db_path)
+        writer.execute("CREATE TABLE items (id INTEGER)")
+        with reader(db_path) as conn:
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 0
+            )
+        close_connection(db_path)
+
+    def test_transaction(self):
+        """Test that transaction() commits on success and rolls back on error."""
+        conn = get_connection(self.db_path)
+        conn.execute("CREATE TABLE items (id INTEGER)")
+
+        with transaction(conn):
+            self.assertTrue(conn.in_transaction)
+            conn.execute("INSERT INTO items VALUES (1)")
+        self.assertFalse(conn.in_transaction)
+
+        with self.assertRaises(RuntimeError):
+            with transaction(conn):
+                conn.execute("INSERT INTO items VALUES (2)")
+                raise RuntimeError("boom")
+        self.assertFalse(conn.in_transaction)
+
+        rows = conn.execute("SELECT id FROM items").fetchall()
+        self.assertEqual([row["id"] for row in rows], [1])
+
+    def test_transaction_rolled_back_when_commit_fails(self):
+        """Test that a failed COMMIT does not leave the transaction open."""
+        db_path = file_database(self)
+        conn = get_connection(db_path)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("PRAGMA busy_timeout = 0")
+        conn.execute("CREATE TABLE items (id INTEGER)")
+
+        # A reader holding a SHARED lock makes COMMIT fail in rollback mode
+        other = sqlite3.connect(db_path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN")
+        other.execute("SELECT * FROM items").fetchall()
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with transaction(conn):
+                conn.execute("INSERT INTO items VALUES (1)")
+        self.assertFalse(conn.in_transaction)
+
+        other.execute("COMMIT")
+        with transaction(conn):
+            conn.execute("INSERT INTO items VALUES (2)")
+
+        rows = conn.execute("SELECT id FROM items").fetchall()
+        self.assertEqual([row["id"] for row in rows], [2])
+        close_connection(db_path)
+
+    def test_connections_closed_on_thread_exit(self):
+        """Test that a thread's connections are closed when the thread exits."""
+        closed = []
+
+        class TrackingConnection(sqlite3.Connection):
+            def close(self):
+                closed.append(self)
+                super().close()
+
+        real_connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            return real_connect(*args, factory=TrackingConnection, **kwargs)
+
+        opened = []
+
+        def thread_func():
+            opened.append(get_connection(self.db_path))
+
+        with mock.patch("gigq.db_utils.sqlite3.connect", connect):
+            thread = threading.Thread(target=thread_func)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(opened), 1)
+        self.assertIn(opened[0], closed)
+
     def test_multiple_databases(self):
         """Test that connections to different databases are managed separately."""
         # Create a second database
-        fd2, db_path2 = tempfile.mkstemp()
-        self.addCleanup(lambda: os.unlink(db_path2))
-        self.addCleanup(lambda: os.close(fd2))
+        db_path2 = memory_database()
 
         # Get connections to both databases
         conn1 = get_connection(self.db_path)
@@ -67,37 +205,34 @@ class TestDBUtils(unittest.TestCase):
 
     def test_thread_isolation(self):
         """Test that each thread gets its own connection."""
+        # Concurrent writers need a file database: under shared cache a
+        # locked table fails at once with SQLITE_LOCKED instead of waiting.
+        db_path = file_database(self)
+
         # Connection in main thread
-        main_conn = get_connection(self.db_path)
+        main_conn = get_connection(db_path)
 
-        # Dictionary to store connections from threads
-        thread_connections = {}
+        # Hold every task until all three run, so each gets its own thread
+        barrier = threading.Barrier(3, timeout=10)
 
-        def thread_func():
-            # Get connection in the thread
-            thread_conn = get_connection(self.db_path)
-            thread_id = threading.get_ident()
-            thread_connections[thread_id] = thread_conn
-
-            # Create a test table
-            thread_conn.execute(
-                f"CREATE TABLE IF NOT EXISTS thread_{thread_id} (id INTEGER)"
-            )
-            thread_conn.commit()
+        def thread_func(_):
+            barrier.wait()
+            try:
+                # Get connection in the thread
+                thread_conn = get_connection(db_path)
+                thread_id = threading.get_ident()
 
-            # Close connection when done
-            close_connection(self.db_path)
+                # Create a test table
+                thread_conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS thread_{thread_id} (id INTEGER)"
+                )
+                return thread_id, thread_conn
+            finally:
+                # Pool threads outlive the test; close their connections
+                close_connections()
 
-        # Create and run threads
-        threads = []
-        for i in range(3):
-            thread = threading.Thread(target=thread_func)
-            threads.append(thread)
-            thread.start()
-
-        # Wait for threads to complete
-        for thread in threads:
-            thread.join()
+        thread_connections = dict(THREAD_POOL.map(thread_func, range(3)))
+        self.assertEqual(len(thread_connections), 3)
 
         # Each thread should have its own connection
         # Different from the main thread's connection
@@ -111,4 +246,55 @@ class TestDBUtils(unittest.TestCase):
                 self.assertIsNot(connections[i], connections[j])
 
         # Close main connection
-        close_connection(self.db_path)
+        close_connection(db_path)
+
+    def test_reader_pool(self):
+        """Test that pooled readers are read-only and reused after release."""
+        db_path = file_database(self)
+        writer = get_connection(db_path)
+        writer.execute("CREATE TABLE items (id INTEGER)")
+        writer.commit()
+
+        conn = acquire_reader(db_path)
+        self.assertEqual(conn.row_factory, sqlite3.Row)
+        with self.assertRaises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items VALUES (1)")
+        release_reader(db_path, conn)
+
+        # The released connection is handed out again
+        with reader(db_path) as conn2:
+            self.assertIs(conn2, conn)
+            # Readers see rows committed by the thread-local writer
+            writer.execute("INSERT INTO items VALUES (1)")
+            writer.commit()
+            count = conn2.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            self.assertEqual(count, 1)
+
+    def test_uri_connection(self):
+        """Test that a shared in-memory database URI is visible to all threads."""
+        uri = self.db_path
+        conn = get_connection(uri)
+        conn.execute("CREATE TABLE items (id INTEGER)")
+        conn.execute("INSERT INTO items VALUES (1)")
+
+        counts = []
+
+        def thread_func():
+            thread_conn = get_connection(uri)
+            self.assertIsNot(thread_conn, conn)
+            counts.append(
+                thread_conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            )
+            close_connection(uri)
+
+        thread = threading.Thread(target=thread_func)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(counts, [1])
+        close_connection(uri)
+
+    def test_reader_in_memory_database(self):
+        """Test that in-memory databases read through the thread-local connection."""
+        with reader(":memory:") as conn:
+            self.assertIs(conn, get_connection(":memory:"))
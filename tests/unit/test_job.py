@@ -2,7 +2,9 @@
 Unit tests for the Job class in GigQ.
 """
 
+import threading
 import unittest
+import uuid
 from gigq import Job, JobStatus
 
 
@@ -79,6 +81,31 @@ class TestJob(unittest.TestCase):
 
         self.assertNotEqual(job1.id, job2.id)
 
+    def test_job_id_format(self):
+        """Test that job IDs are canonical UUID4 strings."""
+        job = Job(name="job", function=example_job_function)
+
+        parsed = uuid.UUID(job.id)
+        self.assertEqual(str(parsed), job.id)
+        self.assertEqual(parsed.version, 4)
+
+    def test_job_id_unique_across_threads(self):
+        """Test that jobs created concurrently never share an ID."""
+        ids = []
+
+        def create_jobs():
+            ids.extend(
+                Job(name="job", function=example_job_function).id for _ in range(500)
+            )
+
+        threads = [threading.Thread(target=create_jobs) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(ids)), 2000)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,7 +7,9 @@ import sqlite3
 import tempfile
 import unittest
 import json
+from unittest import mock
 from gigq import Job, JobQueue, JobStatus
+from gigq.job_queue import _JOB_COLUMNS, SCHEMA_VERSION
 
 
 def example_job_function(value=0):
@@ -33,6 +35,17 @@ class TestJobQueue(unittest.TestCase):
         os.close(self.db_fd)
         os.unlink(self.db_path)
 
+    def test_schema_version_skips_initialization(self):
+        """Test that an up-to-date schema is not recreated on every JobQueue."""
+        conn = sqlite3.connect(self.db_path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+        self.assertEqual(version, SCHEMA_VERSION)
+
+        with mock.patch.object(JobQueue, "_create_schema") as create_schema:
+            JobQueue(self.db_path)
+        create_schema.assert_not_called()
+
     def test_submit_job(self):
         """Test that a job can be submitted to the queue."""
         job = Job(name="test_job", function=example_job_function, params={"value": 42})
@@ -46,6 +59,77 @@ class TestJobQueue(unittest.TestCase):
         self.assertEqual(status["name"], "test_job")
         self.assertEqual(status["status"], JobStatus.PENDING.value)
 
+    def test_submit_many(self):
+        """Test that several jobs can be submitted in one call."""
+        jobs = [
+            Job(name=f"job_{i}", function=example_job_function, params={"value": i})
+            for i in range(5)
+        ]
+
+        job_ids = self.queue.submit_many(jobs)
+        self.assertEqual(job_ids, [job.id for job in jobs])
+
+        for i, job_id in enumerate(job_ids):
+            status = self.queue.get_status(job_id)
+            self.assertEqual(status["name"], f"job_{i}")
+            self.assertEqual(status["params"], {"value": i})
+            self.assertEqual(status["status"], JobStatus.PENDING.value)
+
+        self.assertEqual(self.queue.submit_many([]), [])
+
+    def test_submit_many_is_atomic(self):
+        """Test that a failing batch does not leave partially submitted jobs."""
+        existing = Job(name="existing", function=example_job_function)
+        self.queue.submit(existing)
+
+        new_job = Job(name="new", function=example_job_function)
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.queue.submit_many([new_job, existing])
+
+        self.assertFalse(self.queue.get_status(new_job.id)["exists"])
+        self.assertEqual(self.queue.stats()["total"], 1)
+
+    def test_submit_many_large_batch(self):
+        """Test that large batches (multi-row INSERTs) store every job."""
+        jobs = [
+            Job(name=f"job_{i}", function=example_job_function, params={"value": i})
+            for i in range(600)
+        ]
+
+        job_ids = self.queue.submit_many(jobs)
+
+        self.assertEqual(job_ids, [job.id for job in jobs])
+        self.assertEqual(self.queue.stats()["pending"], 600)
+        for i in (0, 255, 256, 599):
+            status = self.queue.get_status(job_ids[i])
+            self.assertEqual(status["name"], f"job_{i}")
+            self.assertEqual(status["params"], {"value": i})
+
+    def test_submit_many_large_batch_is_atomic(self):
+        """Test that a failing multi-row batch is rolled back entirely."""
+        existing = Job(name="existing", function=example_job_function)
+        self.queue.submit(existing)
+
+        jobs = [Job(name=f"job_{i}", function=example_job_function) for i in range(300)]
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.queue.submit_many(jobs + [existing])
+
+        self.assertEqual(self.queue.stats()["total"], 1)
+
+    def test_get_status_returns_all_columns(self):
+        """Test that get_status includes every column of the jobs table."""
+        job_id = self.queue.submit(Job(name="job", function=example_job_function))
+
+        conn = sqlite3.connect(self.db_path)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+        conn.close()
+        self.assertEqual(list(_JOB_COLUMNS), columns)
+
+        status = self.queue.get_status(job_id)
+        self.assertEqual(set(status), set(columns) | {"exists", "executions"})
+        self.assertEqual(status["id"], job_id)
+        self.assertEqual(status["function_name"], "example_job_function")
+
     def test_cancel_job(self):
         """Test that a pending job can be cancelled."""
         job = Job(name="test_job", function=example_job_function)
@@ -102,6 +186,10 @@ class TestJobQueue(unittest.TestCase):
         # List only cancelled jobs
         cancelled_jobs = self.queue.list_jobs(status=JobStatus.CANCELLED)
         self.assertEqual(len(cancelled_jobs), 1)
+        self.assertEqual(set(cancelled_jobs[0]), set(_JOB_COLUMNS))
+        self.assertEqual(cancelled_jobs[0]["id"], jobs[0])
+        self.assertEqual(cancelled_jobs[0]["params"], {"value": 0})
+        self.assertEqual(cancelled_jobs[0]["dependencies"], [])
 
     def test_requeue_job(self):
         """Test that a failed job can be requeued."""
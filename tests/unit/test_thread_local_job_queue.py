@@ -2,11 +2,11 @@
 Unit tests for the JobQueue class with thread-local connections.
 """
 
-import os
-import tempfile
-import threading
 import unittest
+from unittest import mock
 from gigq import Job, JobQueue, JobStatus, close_connections
+from gigq.db_utils import get_connection
+from tests.db_helpers import THREAD_POOL, file_database, memory_database
 
 
 def example_job_function(value=0):
@@ -18,16 +18,16 @@ class TestThreadLocalJobQueue(unittest.TestCase):
     """Tests for the JobQueue class with thread-local connections."""
 
     def setUp(self):
-        """Set up a temporary database for testing."""
-        self.db_fd, self.db_path = tempfile.mkstemp()
+        """Set up a shared in-memory database for testing."""
+        # Nothing touches the filesystem. Tests with concurrent writers use
+        # file_database() instead.
+        self.db_path = memory_database()
         self.queue = JobQueue(self.db_path)
 
     def tearDown(self):
-        """Clean up the temporary database."""
+        """Clean up the in-memory database."""
         self.queue.close()
-        close_connections()  # Ensure all connections are closed
-        os.close(self.db_fd)
-        os.unlink(self.db_path)
+        close_connections()  # Closing the last connection frees the database
 
     def test_connection_reuse(self):
         """Test that connections are reused within the same thread."""
@@ -43,64 +43,71 @@ class TestThreadLocalJobQueue(unittest.TestCase):
             status = self.queue.get_status(job_id)
             self.assertEqual(status["status"], JobStatus.PENDING.value)
 
+    def test_submit_many_reuses_connection(self):
+        """Test that a batch submission and status reads share the queue."""
+        jobs = [Job(name=f"job_{i}", function=example_job_function) for i in range(5)]
+        job_ids = self.queue.submit_many(jobs)
+
+        for job_id in job_ids:
+            status = self.queue.get_status(job_id)
+            self.assertEqual(status["status"], JobStatus.PENDING.value)
+
+    def test_close_keeps_thread_connection(self):
+        """Test that closing a queue leaves the thread's connection reusable."""
+        conn = get_connection(self.db_path)
+        self.queue.close()
+
+        self.assertIs(get_connection(self.db_path), conn)
+        with mock.patch.object(JobQueue, "close") as close:
+            with JobQueue(self.db_path, initialize=False) as queue:
+                job_id = queue.submit(Job(name="job", function=example_job_function))
+                close.assert_not_called()
+            close.assert_called_once_with()
+
+        self.assertEqual(
+            self.queue.get_status(job_id)["status"], JobStatus.PENDING.value
+        )
+
     def test_threaded_job_operations(self):
         """Test job operations in multiple threads."""
+        # Concurrent writers need a file database: under shared cache a
+        # locked table fails at once with SQLITE_LOCKED instead of waiting.
+        db_path = file_database(self)
+        main_queue = JobQueue(db_path)
+
         # Submit a job in the main thread
         main_job = Job(name="main_job", function=example_job_function)
-        main_job_id = self.queue.submit(main_job)
-
-        # Dictionary to store results from threads
-        thread_results = {}
+        main_job_id = main_queue.submit(main_job)
 
         def thread_func(thread_id):
             try:
                 # Create a thread-specific queue
-                thread_queue = JobQueue(self.db_path, initialize=False)
-
-                # Submit a job
-                job = Job(name=f"thread_{thread_id}_job", function=example_job_function)
-                job_id = thread_queue.submit(job)
+                with JobQueue(db_path, initialize=False) as thread_queue:
+                    # Submit a job
+                    job = Job(
+                        name=f"thread_{thread_id}_job", function=example_job_function
+                    )
+                    job_id = thread_queue.submit(job)
 
-                # Get status of the main job
-                main_status = thread_queue.get_status(main_job_id)
+                    # Get status of the main job
+                    main_status = thread_queue.get_status(main_job_id)
 
-                # Store results
-                thread_results[thread_id] = {
-                    "job_id": job_id,
-                    "main_status": main_status["status"],
-                }
+                return {"job_id": job_id, "main_status": main_status["status"]}
+            finally:
+                # Pool threads outlive the test; close their connections
+                close_connections()
 
-                # Cleanup
-                thread_queue.close()
-            except Exception as e:
-                thread_results[thread_id] = {"error": str(e)}
-
-        # Create and run threads
-        threads = []
-        for i in range(3):
-            thread = threading.Thread(target=thread_func, args=(i,))
-            threads.append(thread)
-            thread.start()
-
-        # Wait for threads to complete
-        for thread in threads:
-            thread.join()
+        # Run the threads on the shared pool; errors are re-raised here
+        thread_results = list(THREAD_POOL.map(thread_func, range(3)))
 
         # Verify results
-        for thread_id, result in thread_results.items():
-            # Check if thread encountered an error
-            self.assertNotIn(
-                "error",
-                result,
-                f"Thread {thread_id} encountered an error: {result.get('error')}",
-            )
-
+        for result in thread_results:
             # Verify the thread could see the main job
             self.assertEqual(result["main_status"], JobStatus.PENDING.value)
 
             # Verify we can see the thread's job from the main thread
             thread_job_id = result["job_id"]
-            thread_job_status = self.queue.get_status(thread_job_id)
+            thread_job_status = main_queue.get_status(thread_job_id)
             self.assertEqual(thread_job_status["status"], JobStatus.PENDING.value)
 
 
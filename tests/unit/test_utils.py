@@ -0,0 +1,74 @@
+"""
+Unit tests for the utils module in GigQ.
+"""
+
+import math
+import unittest
+import uuid
+from datetime import datetime
+from unittest import mock
+from gigq import utils
+from gigq.utils import json_dumps, json_loads
+
+
+class TestJsonHelpers(unittest.TestCase):
+    """Tests for json_dumps and json_loads."""
+
+    def test_roundtrip(self):
+        """Test that values survive a dumps/loads roundtrip."""
+        value = {"name": "job", "values": [1, 2.5, None, True], "nested": {"a": "b"}}
+        text = json_dumps(value)
+        self.assertIsInstance(text, str)
+        self.assertEqual(json_loads(text), value)
+
+    def test_empty_list_text(self):
+        """Test that an empty list is stored as '[]' (used in worker queries)."""
+        self.assertEqual(json_dumps([]), "[]")
+
+    def test_compact_text(self):
+        """Test that stored text is compact and the same with or without orjson."""
+        value = {"name": "café", "x": 1e16, "y": 0.1, "result": [1, 2], "ok": True}
+        expected = '{"name":"caf\\u00e9","x":1e+16,"y":0.1,"result":[1,2],"ok":true}'
+        with mock.patch.object(utils, "orjson", None):
+            self.assertEqual(json_dumps(value), expected)
+        self.assertEqual(json_dumps(value), expected)
+        self.assertEqual(json_loads(expected), value)
+
+    def test_fallback_for_unsupported_values(self):
+        """Test values orjson rejects are still serialized like json does."""
+        self.assertEqual(json_loads(json_dumps({1: "a"})), {"1": "a"})
+        self.assertTrue(math.isnan(json_loads("[NaN]")[0]))
+
+    def test_wide_integers(self):
+        """Test that integers wider than 64 bits are not read back as floats."""
+        for value in (2**64, 2**70 + 1, -(2**63) - 1):
+            with self.subTest(value=value):
+                loaded = json_loads(json_dumps({"value": value}))
+                self.assertIsInstance(loaded["value"], int)
+                self.assertEqual(loaded["value"], value)
+
+    def test_same_behavior_with_and_without_orjson(self):
+        """Test that installing orjson does not change what is stored or read."""
+        for backend in (utils.orjson, None):
+            with (
+                self.subTest(orjson=backend),
+                mock.patch.object(utils, "orjson", backend),
+            ):
+                text = json_dumps({"nan": float("nan"), "inf": float("inf")})
+                self.assertEqual(text, '{"nan":NaN,"inf":Infinity}')
+                loaded = json_loads(text)
+                self.assertTrue(math.isnan(loaded["nan"]))
+                self.assertEqual(loaded["inf"], float("inf"))
+
+                for value in (datetime(2026, 1, 1), uuid.uuid4()):
+                    with self.assertRaises(TypeError):
+                        json_dumps({"value": value})
+
+    def test_without_orjson(self):
+        """Test that the helpers work when orjson is not installed."""
+        with mock.patch.object(utils, "orjson", None):
+            self.assertEqual(json_loads(json_dumps({"a": [1, 2]})), {"a": [1, 2]})
+
+
+if __name__ == "__main__":
+    unittest.main()
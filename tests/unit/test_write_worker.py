@@ -0,0 +1,150 @@
+"""
+Unit tests for the write_worker module in GigQ.
+"""
+
+import gc
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from gigq import write_worker
+from gigq.db_utils import close_connections, get_connection
+from gigq.write_worker import WriteWorker, _group_by_statement, get_write_worker
+
+INSERT_SQL = "INSERT INTO items (id) VALUES (?)"
+
+
+class TestWriteWorker(unittest.TestCase):
+    """Tests for the WriteWorker class."""
+
+    def setUp(self):
+        """Set up a temporary database with a single table."""
+        self.db_fd, self.db_path = tempfile.mkstemp()
+        conn = get_connection(self.db_path)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+
+    def tearDown(self):
+        """Clean up the temporary database."""
+        close_connections()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def _count(self):
+        conn = get_connection(self.db_path)
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def test_get_write_worker(self):
+        """Test that one WriteWorker is shared per database path."""
+        worker = get_write_worker(self.db_path)
+        self.assertIsInstance(worker, WriteWorker)
+        self.assertIs(get_write_worker(self.db_path), worker)
+
+    def test_write_worker_released(self):
+        """Test that a path's WriteWorker is dropped once nothing uses it."""
+        worker = get_write_worker(self.db_path)
+        self.assertIn(self.db_path, write_worker._write_workers)
+
+        del worker
+        gc.collect()
+        self.assertNotIn(self.db_path, write_worker._write_workers)
+
+    def test_execute(self):
+        """Test that a single write is committed before execute returns."""
+        WriteWorker(self.db_path).execute(INSERT_SQL, (1,))
+        self.assertEqual(self._count(), 1)
+
+    def test_concurrent_writes(self):
+        """Test that writes from many threads are all committed."""
+        worker = WriteWorker(self.db_path, max_batch_size=4)
+        errors = []
+
+        def thread_func(thread_index):
+            try:
+                for i in range(10):
+                    worker.execute(INSERT_SQL, (thread_index * 100 + i,))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                close_connections()
+
+        threads = [threading.Thread(target=thread_func, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self._count(), 80)
+
+    def test_failed_write_does_not_affect_batch(self):
+        """Test that only the failing write raises when a batch fails."""
+        worker = WriteWorker(self.db_path)
+        worker.execute(INSERT_SQL, (1,))
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            worker.execute(INSERT_SQL, (1,))
+
+        worker.execute(INSERT_SQL, (2,))
+        self.assertEqual(self._count(), 2)
+
+    def test_failed_write_in_shared_batch(self):
+        """Test that a failing write in a coalesced batch only fails itself."""
+        worker = WriteWorker(self.db_path)
+        worker.execute(INSERT_SQL, (1,))
+
+        batch_sizes = []
+
+        def group_by_statement(batch):
+            batch_sizes.append(len(batch))
+            return _group_by_statement(batch)
+
+        errors = {}
+
+        def thread_func(item_id):
+            try:
+                worker.execute(INSERT_SQL, (item_id,))
+            except Exception as e:
+                errors[item_id] = e
+            finally:
+                close_connections()
+
+        # Hold the leader lock so every thread's write is queued before any
+        # of them is committed, then let them all go as one batch.
+        item_ids = [1, 2, 3, 4, 5]
+        with mock.patch(
+            "gigq.write_worker._group_by_statement", side_effect=group_by_statement
+        ):
+            with worker._leader:
+                threads = [
+                    threading.Thread(target=thread_func, args=(item_id,))
+                    for item_id in item_ids
+                ]
+                for thread in threads:
+                    thread.start()
+                deadline = time.monotonic() + 10
+                while worker._pending.qsize() < len(item_ids):
+                    self.assertLess(time.monotonic(), deadline)
+                    time.sleep(0.001)
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(list(errors), [1])
+        self.assertIsInstance(errors[1], sqlite3.IntegrityError)
+        self.assertEqual(self._count(), 5)
+        self.assertEqual(batch_sizes, [len(item_ids)])
+
+    def test_in_memory_database(self):
+        """Test that in-memory databases are written on the calling thread."""
+        conn = get_connection(":memory:")
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+
+        WriteWorker(":memory:").execute(INSERT_SQL, (1,))
+
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()